@@ -1,8 +1,9 @@
 """Basic classes and functions."""
 
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Union
 import math
 import copy
+import numpy as np
 
 class Iterator:
     
@@ -57,30 +58,45 @@ def dict_to_str(item: dict) -> str:
     
     return str(list(item.values()))
 
-def inv_logit(value: float) -> float:
+def inv_logit(value: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
     
     """
-    Returns the inverse logit of a numeric value.
+    Returns the inverse logit of a numeric value or array of values.
     """
     
-    output = math.exp(value) / (1 + math.exp(value))
-    return output
+    # Scalar fast path using the numerically stable form for each sign
+    if isinstance(value, (int, float)):
+        if value >= 0:
+            return 1 / (1 + math.exp(-value))
+        ex = math.exp(value)
+        return ex / (1 + ex)
+    
+    # Array path: overflow of exp(-x) for very negative x correctly resolves to 0
+    with np.errstate(over = 'ignore'):
+        return 1.0 / (1.0 + np.exp(-np.asarray(value, dtype = np.float64)))
 
-def map_inf_to_1(number: float) -> float:
+def map_inf_to_1(number: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
     
     """
-    Maps a number to a range between 0 and 1, where 0 -> 0 and infinity -> 1.
+    Maps a number (or array of numbers) to a range between 0 and 1, where 0 -> 0 and infinity -> 1.
     """
+    
+    if isinstance(number, (int, float)):
+        return number / (1 + number)
+    
+    number = np.asarray(number, dtype = np.float64)
+    return number / (1.0 + number)
 
-    return number / (1 + number)
-
-def map_inf_to_0(number: float) -> float:
+def map_inf_to_0(number: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
                      
     """
-    Maps a number to a range between 0 and 1, where 0 -> 1 and infinity -> 0.
+    Maps a number (or array of numbers) to a range between 0 and 1, where 0 -> 1 and infinity -> 0.
     """
     
-    return 1 - map_inf_to_1(number)
+    if isinstance(number, (int, float)):
+        return 1 / (1 + number)
+    
+    return np.reciprocal(1.0 + np.asarray(number, dtype = np.float64))
 
 def type_str(obj: object):
     
@@ -5,11 +5,27 @@ from ..core.cleaners import is_datetime, str_to_datetime
 import re
 import io
 import copy
+from collections import defaultdict, deque
 import requests
 import numpy as np
 import pandas as pd
 from PyPDF2 import PdfFileReader, PdfReader, PdfWriter
 
+# Metadata keys checked for a document date, in order of preference
+_PDF_DATE_KEYS = ('/CreationDate', 'CreationDate', 'creationdate', '/Date', 'Date', 'date')
+
+# Translation table replacing punctuation around links with spaces
+_LINK_TRANSLATE = str.maketrans({c: ' ' for c in '\n’;,|[]{}"\'□“”^©'})
+
+# Substrings marking a token as a potential link ('.co' also covers '.com' and '.co.uk')
+_LINK_MARKERS = ('https:', 'http:', 'www.', '.org', '.net', '.io', '.co', '.gov')
+
+# Leading labels and brackets, and trailing brackets, to remove from potential links
+_LINK_AFFIX_RE = re.compile(r'^(?:source:|vSee:|See:|Abstract|Guard\.iii|[():])+|[():]+$', re.IGNORECASE)
+
+# Heading marking the start of a references section, matched against a whole line
+_REFS_RE = re.compile(r'(?:References|Bibliography|Works Cited):?', re.IGNORECASE)
+
 def pdf_to_dict(file_path = None):
     
     """
@@ -28,9 +44,7 @@ def pdf_to_dict(file_path = None):
     
     # Iterating throigh pages and extracting text
     first_page_raw = pdf_file.pages[0]
-    raw_text = []
-    for i in pdf_file.pages:
-        raw_text.append(i.extract_text())
+    raw_text = [page.extract_text() for page in pdf_file.pages]
     
     # Joining text list to make string
     full_text = ' \n '.join(raw_text)
@@ -70,9 +84,7 @@ def pdf_url_to_dict(url = None):
     
     # Iterating throigh pages and extracting text
     first_page_raw = pdf_file.pages[0].extract_text()
-    raw_text = []
-    for i in pdf_file.pages:
-        raw_text.append(i.extract_text())
+    raw_text = [page.extract_text() for page in pdf_file.pages]
     
     # Joining text list to make string
     full_text = ' \n '.join(raw_text)
@@ -105,34 +117,55 @@ def parse_pdf_text(input_data):
     # Splitting text by line breaks
     lines = text.split('\n')
     
-    # Calculating mean length of lines
-    mean_length = pd.Series(lines).apply(len).describe()['mean']
-    
-    # Reformatting lines to reduce errors from PDF import
+    # Calculating mean length of lines and the threshold for short lines (20% of mean)
+    lengths = [len(line) for line in lines]
+    threshold = (sum(lengths) / len(lengths)) / 5
+    
+    # Locating start of references section, if any, to exclude it from the parsed text. Using the last line (or page
+    # within a line) consisting only of a references heading, as reference lists come at the end. Done before short
+    # lines are merged, as a heading line is usually short enough to be merged into the line before it
+    for i in range(len(lines) - 1, -1, -1):
+        segments = lines[i].split('<p>')
+        refs_segments = [j for j, segment in enumerate(segments) if _REFS_RE.fullmatch(segment.strip())]
+        if refs_segments:
+            lines = lines[:i] + ['<p>'.join(segments[:refs_segments[-1]])]
+            lengths = lengths[:i] + [len(lines[i])]
+            break
+    
+    # Reformatting lines to reduce errors from PDF import. Removed lines are tombstoned
+    # with None and positions indexes live occurrences, so lookups and removals are O(1)
     new_lines = []
+    positions = defaultdict(deque)
+    prev = None
     
     # Iterating through each line
-    for i in range(0, len(lines)):
-        length = len(lines[i])
+    for i, line in enumerate(lines):
+        length = lengths[i]
         
-        # Checking if line is relatively short for document (under 20% of mean)
-        if length <= (mean_length / 5):
+        # Checking if line is relatively short for document
+        if length <= threshold:
             
             # If the length is 2 characters or more, adds line to previous line
             if (length >= 2) and (i != 0):
-                new_line = (lines[i-1] + lines[i])
+                new_line = prev + line
                 
                 # Removing previous line to prevent duplicates
-                if lines[i-1] in new_lines:
-                    new_lines.remove(lines[i-1])
+                if positions.get(prev):
+                    new_lines[positions[prev].popleft()] = None
                 
                 # Appending result to list
+                positions[new_line].append(len(new_lines))
                 new_lines.append(new_line)
 
         else:
             # If line is not shorter than minumum, appending line to lines
-            if lines[i] not in new_lines:
-                new_lines.append(lines[i])
+            if not positions.get(line):
+                positions[line].append(len(new_lines))
+                new_lines.append(line)
+        
+        prev = line
+    
+    new_lines = [line for line in new_lines if line is not None]
     
     # Cleaning text
     new_lines = pd.Series(new_lines).str.replace(' \.', '.', regex = False).str.replace(' ;', ';', regex = False).str.replace(' :', ':', regex = False).str.replace(' ,', ',', regex = False).str.strip().to_list()
@@ -141,11 +174,11 @@ def parse_pdf_text(input_data):
     text = ' '.join(new_lines[1:]).replace('<p>', '\n').replace('  ', '')
     
     # Removing paragraph tags
-    new_lines = pd.Series(new_lines).str.replace('<p>', '\n', regex = False).to_list()
+    new_lines = [line.replace('<p>', '\n') for line in new_lines]
     
     # Creating output dictionary
     output = {'top': new_lines[0:5],
-             'main_body': text[:refs_index]}
+             'main_body': text}
     
     return output
 
@@ -175,35 +208,22 @@ def parse_pdf_links(input_data):
         ):
             
             # Cleaning text
-            text = text.replace(' /', '/').replace(': ', ':').replace(' :', ':').replace('\n', ' ').replace('’', ' ').replace(';', ' ').replace(',', ' ').replace('|', ' ').replace('[', ' ').replace(']', ' ').replace('}', ' ').replace('{', ' ').replace('"', ' ').replace("'", ' ').replace('□', ' ').replace('“', ' ').replace('”', ' ').replace('^', ' ').replace('©', ' ').replace('   ', '').replace('  ', ' ')
+            text = text.replace(' /', '/').replace(': ', ':').replace(' :', ':').translate(_LINK_TRANSLATE).replace('   ', '').replace('  ', ' ')
             
             # Splitting text into strings
             text_split = text.split(' ')
             
-            # Extracting potential links
-            links_res = [
-                            i for i in text_split if (
-                                                    ('https:' in i.lower()) 
-                                                    or ('http:' in i.lower()) 
-                                                    or ('www.' in i.lower())
-                                                    or ('.com' in i.lower())
-                                                    or ('.org' in i.lower())
-                                                    or ('.net' in i.lower())
-                                                    or ('.io' in i.lower())
-                                                    or ('.co.uk' in i.lower())
-                                                    or ('.co' in i.lower())
-                                                    or ('.gov' in i.lower())
-                                                    )
-                        ]
+            # Extracting potential links, cleaning them, and removing very short strings and repeats in one pass
+            links = {
+                        cleaned
+                        for token in text_split
+                        for lowered in (token.lower(),)
+                        if any(marker in lowered for marker in _LINK_MARKERS)
+                        for cleaned in (_LINK_AFFIX_RE.sub('', token),)
+                        if len(cleaned) > 3
+                    }
             
-            # Cleaning links
-            links = [i.strip(')').strip('(').strip('source:').strip('See:').strip('vSee:').strip('Abstract').strip('Guard.iii').strip(':') for i in links_res]
-            
-            # Removing very string strings that are unlikely to be valid links
-            links = [i for i in links if len(i) > 3]
-            
-            # Removing repeats
-            result = list(set(links))
+            result = list(links)
             
             return result
     
@@ -338,29 +358,15 @@ def parse_pdf_date(pdf_dict):
     # Retrieving metadata
     metadata = pdf_dict['metadata']
     
-    # Checking for date metadata with key '/CreationDate'
-    if ('/CreationDate' in metadata.keys()):
-        date = metadata['/CreationDate']
-    
-    # Checking for date metadata with key '/Date'
-    if ('/Date' in metadata.keys()):
-            date = metadata['/Date']
-            
-    # Checking for date metadata with key 'CreationDate'
-    if ('CreationDate' in metadata.keys()):
-        date = metadata['CreationDate']
+    # Retrieving the first populated date key, in order of preference
+    for key in _PDF_DATE_KEYS:
+        if metadata.get(key):
+            date = metadata[key]
+            break
     
-    # Checking for date metadata with key 'creationdate'
-    if ('creationdate' in metadata.keys()):
-        date = metadata['CreationDate']
-    
-    # Checking for date metadata with key 'Date'
-    if ('Date' in metadata.keys()):
-            date = metadata['Date']
-            
-    # Checking for date metadata with key 'date'
-    if ('date' in metadata.keys()):
-            date = metadata['Date']
+    # If no date metadata found, returning None
+    else:
+        return None
     
     # Checking if the result is already a datetime object; if yes, returning it
     if is_datetime(date) != True:
@@ -4,8 +4,54 @@ from ..core.basics import map_inf_to_1, map_inf_to_0
 from ..core.cleaners import str_to_datetime
 
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Tuple
-import copy
+import calendar
+import functools
+import numpy as np
+
+# Factors converting seconds to other units
+_MINS = 1 / 60
+_HOURS = 1 / 3600
+_DAYS = 1 / 86400
+_WEEKS = 1 / 604800
+
+# Lengths of common and leap years in seconds
+_YEAR_SECS = 365 * 86400
+_LEAP_YEAR_SECS = 366 * 86400
+
+
+@functools.lru_cache(maxsize = 8192)
+def _parse(string: str) -> datetime:
+    
+    """
+    Cached conversion of a date or time string to a datetime object.
+    """
+    
+    return str_to_datetime(string, False)
+
+
+@functools.lru_cache(maxsize = 1024)
+def _year_start(year: int) -> datetime:
+    
+    """
+    Cached datetime for the start of a year.
+    """
+    
+    return datetime(year, 1, 1)
+
+
+def _to_datetime(date) -> datetime:
+    
+    """
+    Converts a date to a datetime object, using the parsing cache for strings.
+    """
+    
+    if isinstance(date, datetime):
+        return date
+    
+    if isinstance(date, str):
+        return _parse(date)
+    
+    return str_to_datetime(date, False)
 
 
 def time_difference(first_date: str = 'request_input', second_date: str = 'request_input') -> timedelta:
@@ -34,17 +80,9 @@ def time_difference(first_date: str = 'request_input', second_date: str = 'reque
     if second_date == 'request_input':
         second_date = input('Second date or time: ')
     
-    # Converting first date to datetime object
-    try:
-        dt1 = str_to_datetime(first_date, False)
-    except:
-        return print('d1_error')
-    
-    # Converting second date to datetime object
-    try:
-        dt2 = str_to_datetime(second_date, False)
-    except:
-        return print('d2_error')
+    # Converting dates to datetime objects; invalid dates raise an error from the parser
+    dt1 = _to_datetime(first_date)
+    dt2 = _to_datetime(second_date)
     
     # Calculating time difference
     result = abs(dt1 - dt2)
@@ -78,12 +116,12 @@ def years_difference(first_date: str = 'request_input', second_date: str = 'requ
         second_date = input('Second date or time: ')
     
     # Converting dates to datetime objects
-    first_dt = str_to_datetime(first_date)
-    second_dt = str_to_datetime(second_date)
+    first_dt = _to_datetime(first_date)
+    second_dt = _to_datetime(second_date)
     
-    # Formatting datetime objects as years
-    first_year = int(first_dt.strftime("%Y"))
-    second_year = int(second_dt.strftime("%Y"))
+    # Retrieving years from datetime objects
+    first_year = first_dt.year
+    second_year = second_dt.year
     
     # Calculating time difference
     result = abs(second_year - first_year)
@@ -108,25 +146,18 @@ def datetime_to_years_decimal(date) -> float:
     """
     
     # Checking types to ensure object is datetime
-    if type(date) == datetime:
+    if isinstance(date, datetime):
         dt = date
     
-    elif type(date) == str:
-        dt = str_to_datetime(date)
-    
-    # Converting datetime object to string in year format
-    year = int(dt.strftime('%Y'))
+    elif isinstance(date, str):
+        dt = _parse(date)
     
-    # Calculating the value of the next year
-    next_year = year + 1
+    # Retrieving year from datetime object
+    year = dt.year
     
-    # Converting inputted year and next year to datetime objects 
-    year_dt = datetime.strptime(str(year), '%Y')
-    next_year_dt = datetime.strptime(str(next_year), '%Y')
-    
-    # Calculating length of the remaining days in the year 
-    year_len = next_year_dt - year_dt
-    remainder = next_year_dt - dt
+    # Calculating length of the year and of the remaining time in the year, in seconds
+    year_len = _LEAP_YEAR_SECS if calendar.isleap(year) else _YEAR_SECS
+    remainder = (_year_start(year + 1) - dt).total_seconds()
     remainder_decimal = remainder / year_len
     
     # Calculating final result
@@ -169,6 +200,15 @@ def years_decimal_timedelta(first_date: str = 'request_input', second_date: str
     result =  abs(second_dt - first_dt)
     
     return result
+
+
+def _years_decimal(first_dt: datetime, second_dt: datetime) -> float:
+    
+    """
+    Returns the number of years separating two datetime objects as a float, without re-parsing.
+    """
+    
+    return abs(datetime_to_years_decimal(second_dt) - datetime_to_years_decimal(first_dt))
     
     
 def timedelta_to_days(timedelta):
@@ -177,17 +217,7 @@ def timedelta_to_days(timedelta):
     Converts datetime timedelta object to a number of days with a decimal remainder.
     """
     
-    # Retrieving time data and converting to float objects 
-    days = float(timedelta.days)
-    seconds = float(timedelta.seconds)
-    
-    # Calculating remainder
-    remainder = seconds / float((60**2)*24)
-    
-    # Calculating final result
-    result = days + remainder
-    
-    return result
+    return timedelta.total_seconds() * _DAYS
     
     
 def timedelta_to_weeks(timedelta):
@@ -196,10 +226,7 @@ def timedelta_to_weeks(timedelta):
     Converts datetime timedelta object to a number of weeks with a decimal remainder.
     """
     
-    # Calculating result
-    result = timedelta_to_days(timedelta) / 7
-    
-    return result
+    return timedelta.total_seconds() * _WEEKS
     
 def timedelta_to_hours(timedelta):
     
@@ -207,10 +234,7 @@ def timedelta_to_hours(timedelta):
     Converts datetime timedelta object to a number of hours with a decimal remainder.
     """
     
-    # Calculating result
-    result = timedelta_to_days(timedelta)*24
-    
-    return result
+    return timedelta.total_seconds() * _HOURS
 
 def timedelta_to_mins(timedelta):
     
@@ -218,10 +242,7 @@ def timedelta_to_mins(timedelta):
     Converts datetime timedelta object to a number of minutes with a decimal remainder.
     """
     
-    # Calculating result
-    result = timedelta_to_days(timedelta)*24*60
-    
-    return result
+    return timedelta.total_seconds() * _MINS
 
 
 def timedelta_to_secs(timedelta):
@@ -236,6 +257,46 @@ def timedelta_to_secs(timedelta):
     return result
 
 
+# Factors converting seconds to each supported unit, for array calculations
+_UNIT_FACTORS = {
+                'weeks': _WEEKS,
+                'days': _DAYS,
+                'hours': _HOURS,
+                'minutes': _MINS,
+                'seconds': 1.0
+                }
+
+# Converters from timedelta objects to each supported unit
+_UNIT_CONV = {
+                'weeks': timedelta_to_weeks,
+                'days': timedelta_to_days,
+                'hours': timedelta_to_hours,
+                'minutes': timedelta_to_mins,
+                'seconds': timedelta_to_secs
+                }
+
+
+def _time_difference_in_units(first_datetime, second_datetime, units: str) -> float:
+    
+    """
+    Returns the time difference between two dates in the selected units, running only that unit's conversion.
+    """
+    
+    # Converting dates to datetime objects once
+    dt1 = _to_datetime(first_datetime)
+    dt2 = _to_datetime(second_datetime)
+    
+    if units == 'years':
+        return _years_decimal(dt1, dt2)
+    
+    try:
+        converter = _UNIT_CONV[units]
+    except KeyError:
+        raise ValueError(f"Units must be one of: 'years', {', '.join(repr(u) for u in _UNIT_CONV)}")
+    
+    return converter(abs(dt1 - dt2))
+
+
 def normalised_time_difference(first_datetime, second_datetime, units: str = 'days') -> float:
     
     """
@@ -260,28 +321,8 @@ def normalised_time_difference(first_datetime, second_datetime, units: str = 'da
     Normalisation function: map_inf_to_1()
     """
     
-    # Calculating time difference
-    td = time_difference(first_datetime, second_datetime)
-    
-    # Converting time difference into selected units
-    
-    if units == 'years':
-        td = years_decimal_timedelta(first_datetime, second_datetime)
-    
-    if units == 'weeks':
-        td = timedelta_to_weeks(td)
-    
-    if units == 'days':
-        td = timedelta_to_days(td)
-    
-    if units == 'hours':
-        td = timedelta_to_hours(td)
-    
-    if units == 'minutes':
-        td = timedelta_to_mins(td)
-    
-    if units == 'seconds':
-        td = timedelta_to_secs(td)
+    # Calculating time difference in selected units
+    td = _time_difference_in_units(first_datetime, second_datetime, units)
     
     # Normalising result
     result = map_inf_to_1(td)
@@ -313,30 +354,81 @@ def normalised_time_difference_inverse(first_datetime, second_datetime, units: s
     Normalisation function: map_inf_to_0()
     """
     
-    # Calculating time difference
-    td = time_difference(first_datetime, second_datetime)
+    # Calculating time difference in selected units
+    td = _time_difference_in_units(first_datetime, second_datetime, units)
     
-    # Converting time difference into selected units
+    # Normalising result
+    result = map_inf_to_0(td)
     
-    if units == 'years':
-        td = years_decimal_timedelta(first_datetime, second_datetime)
+    return result
+
+
+def _mapped_array(values: np.ndarray, lookup: dict, dtype) -> np.ndarray:
     
-    if units == 'weeks':
-        td = timedelta_to_weeks(td)
+    """
+    Builds a contiguous array of the given dtype by mapping each element of an object array through a lookup dictionary.
+    """
     
-    if units == 'days':
-        td = timedelta_to_days(td)
+    return np.fromiter((lookup[v] for v in values.ravel()), dtype = dtype, count = values.size).reshape(values.shape)
+
+
+def normalised_time_difference_batch(first_datetimes, second_datetimes, units: str = 'days') -> np.ndarray:
     
-    if units == 'hours':
-        td = timedelta_to_hours(td)
+    """
+    Calculates the normalised time differences between two arrays of dates/times.
     
-    if units == 'minutes':
-        td = timedelta_to_mins(td)
+    Parameters
+    ----------
+    first_datetimes : array-like of str or datetime.datetime
+        first dates for comparison as strings or datetime objects.
+    second_datetimes : array-like of str or datetime.datetime
+        second dates for comparison as strings or datetime objects.
+    units : str
+        units for time difference calculation. Defaults to 'days'.
     
-    if units == 'seconds':
-        td = timedelta_to_secs(td)
+    Returns
+    -------
+    result : numpy.ndarray
+        values between 0 and 1, where 0 is 0 time difference and 1 is infinity.
+    
+    Notes
+    -----
+    Normalisation function: map_inf_to_1()
+    
+    Inputs are compared elementwise and follow NumPy broadcasting rules, so a pairwise matrix for a 
+    set of dates can be calculated by passing arrays of shape (n, 1) and (1, n). Each distinct date 
+    is only parsed once.
+    """
+    
+    # Converting inputs to object arrays, preserving their shapes for broadcasting
+    first_datetimes = np.asarray(first_datetimes, dtype = object)
+    second_datetimes = np.asarray(second_datetimes, dtype = object)
+    
+    # Parsing each distinct date once
+    unique_dates = set(first_datetimes.ravel()).union(second_datetimes.ravel())
+    parsed = {d: _to_datetime(d) for d in unique_dates}
+    
+    # Calculating time differences in selected units
+    if units == 'years':
+        years = {d: datetime_to_years_decimal(dt) for d, dt in parsed.items()}
+        first_arr = _mapped_array(first_datetimes, years, np.float64)
+        second_arr = _mapped_array(second_datetimes, years, np.float64)
+        td = np.abs(second_arr - first_arr)
+    
+    else:
+        try:
+            factor = _UNIT_FACTORS[units]
+        except KeyError:
+            raise ValueError(f"Units must be one of: 'years', {', '.join(repr(u) for u in _UNIT_FACTORS)}")
+        
+        # Storing dates as contiguous datetime64[us] arrays and differencing them as int64 microseconds; microseconds
+        # match datetime's own resolution and, unlike nanoseconds, cover all years from 1 to 9999 without overflow
+        datetimes64 = {d: np.datetime64(dt, 'us') for d, dt in parsed.items()}
+        first_arr = _mapped_array(first_datetimes, datetimes64, 'M8[us]')
+        second_arr = _mapped_array(second_datetimes, datetimes64, 'M8[us]')
+        td = np.abs((first_arr - second_arr).view('i8')) * (factor / 1e6)
     
     # Normalising result
-    result = map_inf_to_0(td)
+    result = map_inf_to_1(td)
     
-    return result
\ No newline at end of file
+    return result
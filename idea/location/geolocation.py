@@ -2,14 +2,181 @@
 
 from ..core.basics import map_inf_to_1, map_inf_to_0
 
-from typing import List, Dict, Tuple
-import copy
+import functools
+import math
+import numpy as np
 import geopy
 from geopy import distance
 from geopy.geocoders import Nominatim
-import geocoder
+from geopy.extra.rate_limiter import RateLimiter
 import webbrowser
-from urllib.parse import quote, urlparse
+from urllib.parse import quote
+
+# Shared Nominatim geolocator, so repeated lookups reuse the same HTTP session
+_GEOLOCATOR = Nominatim(user_agent="location_app")
+
+# Nominatim lookups limited to one request per second, as required by Nominatim's usage policy
+_GEOCODE = RateLimiter(_GEOLOCATOR.geocode, min_delay_seconds = 1, swallow_exceptions = False)
+_REVERSE = RateLimiter(_GEOLOCATOR.reverse, min_delay_seconds = 1, swallow_exceptions = False)
+
+# Translation table removing brackets and spaces from coordinate strings
+_COORD_STRIP = str.maketrans('', '', '[]{} ')
+
+# URL templates for looking up coordinates on mapping platforms
+_LOOKUP_URLS = {
+                'google earth': 'https://earth.google.com/web/@{lat},{lon}',
+                'google maps': 'https://www.google.com/maps/search/?api=1&query={q}',
+                'wikimapia': 'http://wikimapia.org/#lang=en&lat={lat}&lon={lon}'
+                }
+
+# Earth's mean radius in each unit supported by geopy distances, for array calculations
+_EARTH_RADIUS = {
+                units: getattr(distance.Distance(kilometers = distance.EARTH_RADIUS), units)
+                for units in ('kilometers', 'km', 'meters', 'm', 'miles', 'mi', 'feet', 'ft', 'nautical', 'nm')
+                }
+
+
+@functools.lru_cache(maxsize = 4096)
+def _geocode(query: str) -> geopy.location.Location:
+    
+    """
+    Cached forward geocoding lookup. Takes a normalised query string.
+    """
+    
+    return _GEOCODE(query)
+
+
+@functools.lru_cache(maxsize = 4096)
+def _reverse(latitude: float, longitude: float) -> geopy.location.Location:
+    
+    """
+    Cached reverse geocoding lookup. Takes rounded coordinates.
+    """
+    
+    return _REVERSE([latitude, longitude])
+
+
+def _normalise_query(query: str) -> str:
+    
+    """
+    Normalises a location query so that equivalent queries share a cache entry.
+    """
+    
+    return ' '.join(str(query).split()).lower()
+
+
+def _coordinates_key(coordinates) -> tuple:
+    
+    """
+    Parses a coordinates string or sequence into a (latitude, longitude) tuple rounded to 6 decimal places.
+    """
+    
+    point = geopy.Point(coordinates)
+    
+    return round(point.latitude, 6), round(point.longitude, 6)
+
+
+def _coordinates_array(coordinates) -> np.ndarray:
+    
+    """
+    Converts an array-like of coordinates to a float array with (latitude, longitude) in the last axis.
+    """
+    
+    # Using numeric inputs directly
+    try:
+        arr = np.asarray(coordinates, dtype = np.float64)
+        if (arr.ndim > 0) and (arr.shape[-1] == 2):
+            return arr
+    
+    except (TypeError, ValueError):
+        pass
+    
+    # Otherwise parsing each set of coordinates individually
+    return np.array([_coordinates_key(c) for c in coordinates], dtype = np.float64)
+
+
+def _haversine(lat1, lon1, lat2, lon2, radius: float) -> np.ndarray:
+    
+    """
+    Vectorised great-circle (Haversine) distance between arrays of coordinates given in degrees.
+    """
+    
+    lat1, lon1, lat2, lon2 = np.radians(lat1), np.radians(lon1), np.radians(lat2), np.radians(lon2)
+    a = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+    
+    return 2 * radius * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+@functools.lru_cache(maxsize = 1)
+def _get_haversine_kernel():
+    
+    """
+    Imports Numba and compiles the Haversine kernel on first use, returning None if Numba is not installed. Deferred so
+    importing this module does not pay Numba's import cost.
+    """
+    
+    try:
+        import numba
+    except ImportError:
+        return None
+    
+    prange = numba.prange
+    
+    @numba.njit(parallel = True, fastmath = True, cache = True)
+    def _haversine_kernel(lat1, lon1, lat2, lon2, radius):
+        
+        """
+        Numba-compiled Haversine distance over flat, equal-length arrays of coordinates given in degrees.
+        """
+        
+        n = lat1.shape[0]
+        result = np.empty(n, dtype = np.float64)
+        
+        for i in prange(n):
+            phi1 = math.radians(lat1[i])
+            phi2 = math.radians(lat2[i])
+            d_phi = phi2 - phi1
+            d_lambda = math.radians(lon2[i] - lon1[i])
+            a = math.sin(d_phi / 2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2)**2
+            result[i] = 2 * radius * math.asin(math.sqrt(min(a, 1.0)))
+        
+        return result
+    
+    return _haversine_kernel
+
+
+def _haversine_distances(first_arr: np.ndarray, second_arr: np.ndarray, radius: float) -> np.ndarray:
+    
+    """
+    Calculates Haversine distances between broadcastable arrays of (latitude, longitude) pairs. 
+    Uses the Numba-compiled kernel if Numba is installed, and NumPy otherwise.
+    """
+    
+    kernel = _get_haversine_kernel()
+    
+    if kernel is None:
+        return _haversine(first_arr[..., 0], first_arr[..., 1], second_arr[..., 0], second_arr[..., 1], radius)
+    
+    # Broadcasting inputs and flattening them to contiguous arrays for the kernel
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(first_arr[..., 0], first_arr[..., 1], second_arr[..., 0], second_arr[..., 1])
+    shape = lat1.shape
+    lat1, lon1, lat2, lon2 = (np.ascontiguousarray(arr).ravel() for arr in (lat1, lon1, lat2, lon2))
+    
+    return kernel(lat1, lon1, lat2, lon2, radius).reshape(shape)
+
+
+@functools.lru_cache(maxsize = 4096)
+def _coordinates_distance(first_coordinates: tuple, second_coordinates: tuple, units: str, geodesic: bool = True) -> float:
+    
+    """
+    Cached distance between two (latitude, longitude) tuples. Uses geodesic distance, or great-circle 
+    distance if geodesic is False.
+    """
+    
+    if geodesic == True:
+        return getattr(distance.geodesic(first_coordinates, second_coordinates), units)
+    
+    return getattr(distance.great_circle(first_coordinates, second_coordinates), units)
 
 
 # Instructions for creating satellite imagery-based maps: https://blog.goodaudience.com/geo-libraries-in-python-plotting-current-fires-bffef9fe3fb7
@@ -37,11 +204,10 @@ def get_coordinates_geocode(coordinates: list = None, latitude: str = 'request_i
     # Formatting coordinates if inputted
     if coordinates != None:
         
-        if coordinates == str:
-            coordinates = coordinates.replace('[').replace(']').replace('{').replace('}')
-            coordinates = coordinates.split(',')
+        if isinstance(coordinates, str):
+            coordinates = coordinates.translate(_COORD_STRIP).split(',')
         
-        if coordinates == list:
+        if isinstance(coordinates, (list, tuple)):
             
             latitude = coordinates[0]
             longitude = coordinates[1]
@@ -59,11 +225,8 @@ def get_coordinates_geocode(coordinates: list = None, latitude: str = 'request_i
     latitude = str(latitude)
     longitude = str(longitude)
         
-    # Initialising Nominatim geolocator object
-    geolocator = Nominatim(user_agent="location_app")
-    
     # Retrieving geocode
-    result = geolocator.reverse([latitude, longitude])
+    result = _reverse(*_coordinates_key([latitude, longitude]))
     
     return result
 
@@ -88,12 +251,9 @@ def get_location_geocode(location: str = 'request_input') -> geopy.location.Loca
     if location == 'request_input':
         location = input('Location details: ')
     
-    # Initialising Nominatim geolocator object
-    geolocator = Nominatim(user_agent="location_app")
-    
     # Retrieving geocode and handling errors
     try:
-        return geolocator.geocode(location)
+        return _geocode(_normalise_query(location))
     
     except:
         raise ValueError('Lookup failed. Please check the location details provided.')
@@ -122,11 +282,10 @@ def get_coordinates_location(coordinates = None, latitude: str = 'request_input'
     # Formatting coordinates if inputted
     if coordinates != None:
         
-        if coordinates == str:
-            coordinates = coordinates.replace('[').replace(']').replace('{').replace('}')
-            coordinates = coordinates.split(',')
+        if isinstance(coordinates, str):
+            coordinates = coordinates.translate(_COORD_STRIP).split(',')
         
-        if coordinates == list:
+        if isinstance(coordinates, (list, tuple)):
             
             latitude = coordinates[0]
             longitude = coordinates[1]
@@ -146,12 +305,9 @@ def get_coordinates_location(coordinates = None, latitude: str = 'request_input'
     # Joining coordinates into one string for geopy
     coordinates = latitude + ', ' + longitude
     
-    # Initialising Nominatim geolocator object
-    geolocator = Nominatim(user_agent="location_app")
-    
     # Retrieving geocode and handling errors
     try:
-        return geolocator.geocode(coordinates).address
+        return _geocode(_normalise_query(coordinates)).address
     
     except:
         raise ValueError('Lookup failed. Please check the coordinates provided.')
@@ -177,12 +333,9 @@ def get_location_coordinates(location: str = 'request_input') -> list:
     if location == 'request_input':
         location = input('Location details: ')
     
-    # Initialising Nominatim geolocator object
-    geolocator = Nominatim(user_agent="location_app")
-    
     # Retrieving geocode and handling errors
     try:
-        output_location = geolocator.geocode(location)
+        output_location = _geocode(_normalise_query(location))
     
     except Exception as e:
         raise Exception
@@ -215,12 +368,9 @@ def get_location_address(location: str = 'request_input') -> str:
     if location == 'request_input':
         location = input('Location details: ')
     
-    # Initialising Nominatim geolocator object
-    geolocator = Nominatim(user_agent="location_app")
-    
     # Retrieving address and handling errors
     try:
-        return geolocator.geocode(location).address
+        return _geocode(_normalise_query(location)).address
     
     except:
         raise ValueError('Lookup failed. Please check the location details provided.')
@@ -246,11 +396,10 @@ def lookup_coordinates(coordinates = None, latitude: str = 'request_input', long
     # Formatting coordinates if inputted
     if coordinates != None:
         
-        if coordinates == str:
-            coordinates = coordinates.replace('[').replace(']').replace('{').replace('}')
-            coordinates = coordinates.split(',')
+        if isinstance(coordinates, str):
+            coordinates = coordinates.translate(_COORD_STRIP).split(',')
         
-        if coordinates == list:
+        if isinstance(coordinates, (list, tuple)):
             latitude = coordinates[0]
             longitude = coordinates[1]
     
@@ -267,32 +416,27 @@ def lookup_coordinates(coordinates = None, latitude: str = 'request_input', long
     latitude = str(latitude)
     longitude = str(longitude)
     
-    # Initialising sites list variable
-    sites_list = ['google earth', 'google maps', 'wikimapia']
-    
-    # If site to search is Google Earth, searching Google Earth
-    if site.lower() == 'google earth':
-        url_base = 'https://earth.google.com/web/@'
-        url = url_base + latitude + ',' + longitude
-        return webbrowser.open(url)
-    
-    # If site to search is Google Maps, searching Google Maps
-    if site.lower() == 'google maps':
-        url_base = 'https://www.google.com/maps/search/?api=1&query='
-        query = quote(latitude + ',' + longitude)
-        url = url_base + query
-        return webbrowser.open(url)
-    
-    # If site to search is Wikimapia, searching Wikimapia
-    if site.lower() == 'wikimapia':
-        url_base = 'http://wikimapia.org/#lang=en&'
-        url = url_base + 'lat='+ latitude + '&lon=' + longitude
-        return webbrowser.open(url)
-    
-    # If site to search is 'all', using recursion to search Google Earth, Google Maps, and Wikipedia
-    elif site == 'all':
-        for item in sites_list:
+    # Formatting site name
+    site = site.lower()
+    
+    # If site to search is 'all', using recursion to search Google Earth, Google Maps, and Wikimapia
+    if site == 'all':
+        for item in _LOOKUP_URLS.keys():
             lookup_coordinates(latitude = latitude, longitude = longitude, site = item)
+        return
+    
+    # Retrieving URL template for selected site
+    if site not in _LOOKUP_URLS:
+        raise ValueError(f"Site must be 'all' or one of: {', '.join(repr(s) for s in _LOOKUP_URLS)}")
+    
+    # Building URL for selected site and opening it
+    url = _LOOKUP_URLS[site].format(
+                                    lat = quote(latitude), 
+                                    lon = quote(longitude), 
+                                    q = quote(latitude + ',' + longitude)
+                                    )
+    
+    return webbrowser.open(url)
 
 def lookup_location(location: str = 'request_input', site: str = 'Google Maps'):
     
@@ -318,7 +462,7 @@ def lookup_location(location: str = 'request_input', site: str = 'Google Maps'):
     return lookup_coordinates(latitude = coordinates[0], longitude = coordinates[1], site = site)
 
 
-def coordinates_distance(first_coordinates: str = 'request_input', second_coordinates: str = 'request_input', units: str = 'kilometers') -> tuple:
+def coordinates_distance(first_coordinates: str = 'request_input', second_coordinates: str = 'request_input', units: str = 'kilometers', geodesic: bool = True) -> tuple:
     
     """
     Returns the distance between two coordinates in units provided by user.
@@ -331,18 +475,14 @@ def coordinates_distance(first_coordinates: str = 'request_input', second_coordi
         the second set of coordinates for comparison.
     units : str
         units to use for distance calculation. Defaults to 'kilometers'.
+    geodesic : bool
+        whether to calculate geodesic distance. If False, uses faster but slightly less accurate great-circle distance. Defaults to True.
     
     Returns
     -------
     result : tuple
         a tuple containing the distance and its units.
     """
-    if type(first_coordinates) == list:
-        first_coordinates = ','.join(first_coordinates)
-    
-    if type(second_coordinates) == list:
-        second_coordinates = ','.join(second_coordinates)
-    
     # Requesting first set of coordinates from user input if none given
     if first_coordinates == 'request_input':
         first_coordinates = input('First coordinates: ')
@@ -351,16 +491,17 @@ def coordinates_distance(first_coordinates: str = 'request_input', second_coordi
     if second_coordinates == 'request_input':
         second_coordinates = input('Second coordinates: ')
     
-    # Calculating distance in inputted units 
-    if units == 'kilometers':
-        res = distance.geodesic(first_coordinates, second_coordinates).kilometers
-    
-    if units == 'miles':
-        res = distance.geodesic(first_coordinates, second_coordinates).miles
+    # Calculating distance in inputted units, using cached result for previously seen coordinates
+    res = _coordinates_distance(
+                                _coordinates_key(first_coordinates), 
+                                _coordinates_key(second_coordinates), 
+                                units, 
+                                geodesic
+                                )
         
     return res, units
 
-def locations_distance(first_location: str = 'request_input', second_location: str = 'request_input', units: str = 'kilometers') -> tuple:
+def locations_distance(first_location: str = 'request_input', second_location: str = 'request_input', units: str = 'kilometers', geodesic: bool = True) -> tuple:
     
     """
     Returns the distance between two coordinates, using units provided by user.
@@ -373,6 +514,8 @@ def locations_distance(first_location: str = 'request_input', second_location: s
         the second location name or address for comparison.
     units : str
         units to use for distance calculation. Defaults to 'kilometers'.
+    geodesic : bool
+        whether to calculate geodesic distance. If False, uses faster but slightly less accurate great-circle distance. Defaults to True.
     
     Returns
     -------
@@ -388,7 +531,7 @@ def locations_distance(first_location: str = 'request_input', second_location: s
     if second_location == 'request_input':
         second_location = input('Second location: ')
     
-    # Retrieving coordinates associated with location from Geopy
+    # Retrieving coordinates associated with locations from Geopy; lookups are cached and rate limited
     first_coordinates = get_location_coordinates(first_location)
     second_coordinates = get_location_coordinates(second_location)
     
@@ -396,7 +539,8 @@ def locations_distance(first_location: str = 'request_input', second_location: s
     return coordinates_distance(
                                 first_coordinates = first_coordinates, 
                                 second_coordinates = second_coordinates, 
-                                units = units
+                                units = units, 
+                                geodesic = geodesic
                                 )
 
 def normalised_coordinates_distance(first_coordinates: str, second_coordinates: str, units: str = 'kilometers') -> float:
@@ -423,8 +567,8 @@ def normalised_coordinates_distance(first_coordinates: str, second_coordinates:
     Normalisation function: map_inf_to_1()
     """
     
-    # Calculating distance
-    distance = coordinates_distance(first_coordinates, second_coordinates, units)
+    # Calculating distance; great-circle precision is sufficient once normalised
+    distance = coordinates_distance(first_coordinates, second_coordinates, units, geodesic = False)
     
     # Normalising distance
     result = map_inf_to_1(distance[0])
@@ -455,8 +599,8 @@ def normalised_coordinates_distance_inverse(first_coordinates: str, second_coord
     Normalisation function: map_inf_to_0()
     """
     
-    # Calculating distance
-    distance = coordinates_distance(first_coordinates, second_coordinates, units)
+    # Calculating distance; great-circle precision is sufficient once normalised
+    distance = coordinates_distance(first_coordinates, second_coordinates, units, geodesic = False)
     
     # Normalising distance
     result = map_inf_to_0(distance[0])
@@ -488,8 +632,8 @@ def normalised_locations_distance(first_location: str, second_location: str, uni
     Normalisation function: map_inf_to_1()
     """
     
-    # Calculating distance
-    distance = locations_distance(first_location, second_location, units)
+    # Calculating distance; great-circle precision is sufficient once normalised
+    distance = locations_distance(first_location, second_location, units, geodesic = False)
     
     # Normalising distance
     result = map_inf_to_1(distance[0])
@@ -520,10 +664,56 @@ def normalised_locations_distance_inverse(first_location: str, second_location:
     Normalisation function: map_inf_to_0()
     """
     
-    # Calculating distance
-    distance = locations_distance(first_location, second_location, units)
+    # Calculating distance; great-circle precision is sufficient once normalised
+    distance = locations_distance(first_location, second_location, units, geodesic = False)
     
     # Normalising distance
     result = map_inf_to_0(distance[0])
     
-    return result
\ No newline at end of file
+    return result
+
+
+def normalised_coordinates_distance_batch(first_coordinates, second_coordinates, units: str = 'kilometers') -> np.ndarray:
+    
+    """
+    Calculates the normalised distances between two arrays of coordinates, using units provided by user.
+    
+    Parameters
+    ----------
+    first_coordinates : array-like
+        the first sets of coordinates for comparison, as (latitude, longitude) pairs or coordinate strings.
+    second_coordinates : array-like
+        the second sets of coordinates for comparison, as (latitude, longitude) pairs or coordinate strings.
+    units : str
+        units to use for distance calculation. Any geopy distance unit, e.g. 'kilometers', 'miles', 'meters', 'feet' or 'nautical'. Defaults to 'kilometers'.
+    
+    Returns
+    -------
+    result : numpy.ndarray
+        values between 0 and 1, where 0 is 0 distance and 1 is infinite distance.
+    
+    Notes
+    -----
+    Normalisation function: map_inf_to_1()
+    
+    Distances are great-circle (Haversine) distances, which are slightly less accurate than the 
+    geodesic distances used by coordinates_distance() but much faster for bulk comparisons. 
+    Inputs are compared elementwise and follow NumPy broadcasting rules, so a pairwise matrix can 
+    be calculated by passing arrays of shape (n, 1, 2) and (1, n, 2).
+    """
+    
+    # Formatting coordinates as float arrays
+    first_arr = _coordinates_array(first_coordinates)
+    second_arr = _coordinates_array(second_coordinates)
+    
+    # Checking units are supported
+    if units not in _EARTH_RADIUS:
+        raise ValueError(f"Units must be one of: {', '.join(repr(u) for u in _EARTH_RADIUS)}")
+    
+    # Calculating distances
+    distances = _haversine_distances(first_arr, second_arr, _EARTH_RADIUS[units])
+    
+    # Normalising distances
+    result = map_inf_to_1(distances)
+    
+    return result
@@ -2,54 +2,105 @@
 
 """Functions for running Exponential Random Graph Model (ERGM) analysis on networks.
 
-Code implementation utilises the RPy2 package to emulate R's ERGM library. 
+Code implementation utilises the RPy2 package to emulate R's ERGM library.
+
+The R environment is only set up when an ERGM function or R object is first accessed, or when
+setup_ergm() is called; required R packages are only installed if they are missing.
 
 Notes
 -----
     * RPy2: https://rpy2.github.io/doc/latest/html/index.html
-    * R ERGM: https://cran.r-project.org/web/packages/ergm/ergm.pdf 
+    * R ERGM: https://cran.r-project.org/web/packages/ergm/ergm.pdf
 """
 
+import importlib
+
+# Names provided lazily by the ergm_functions module
+_ERGM_FUNCTIONS = (
+                    'casenet_fit_ergm',
+                    'case_fit_ergm',
+                    'create_ergm',
+                    'fit_ergm',
+                    'edge_probabilities',
+                    'casenet_edge_probabilities',
+                    'case_edge_probabilities',
+                    'ergm_edge_probabilities'
+                    )
+
+# Names of R objects provided lazily once the R environment is set up
+_R_OBJECTS = ('r', 'robjects', 'rpackages', 'libr', 'importr', 'IntVector', 'Formula', 'numpy2ri', 'pandas2ri', 'base', 'utils', 'ergm', 'networkr')
+
+# R packages required for ERGM analysis
+_R_PACKAGES = ('ergm', 'network')
+
+_R_ENV_READY = False
+
+def _ensure_r_env():
+
+    """
+    Imports RPy2, installs any missing R packages, and loads them. Only runs once per session.
+    """
+
+    global _R_ENV_READY
+    global r, robjects, rpackages, libr, importr, IntVector, Formula, numpy2ri, pandas2ri, base, utils, ergm, networkr
+
+    if _R_ENV_READY == True:
+        return
+
+    import rpy2 as r
+    from rpy2 import robjects
+    import rpy2.robjects.packages as rpackages
+    from rpy2.robjects import lib as libr
+    from rpy2.robjects.packages import importr
+    from rpy2.robjects import IntVector
+    from rpy2.robjects import Formula
+    from rpy2.robjects import numpy2ri
+    from rpy2.robjects import pandas2ri
+
+    numpy2ri.activate()
 
-import rpy2 as r
-globals()['r'] = r
+    base = importr('base')
+    utils = importr('utils')
 
-from rpy2 import robjects
-globals()['robjects'] = robjects
+    # Installing required R packages only if they are missing
+    missing = [package for package in _R_PACKAGES if not rpackages.isinstalled(package)]
+    if len(missing) > 0:
+        utils.chooseCRANmirror(ind=1)
+        utils.install_packages(robjects.StrVector(missing))
 
-import rpy2.robjects.packages as rpackages
-globals()['rpackages'] = rpackages
+    ergm = importr('ergm', on_conflict="warn")
+    networkr = importr('network', on_conflict="warn")
 
-from rpy2.robjects import lib
-globals()['libr'] = lib
+    _R_ENV_READY = True
 
-from rpy2.robjects.packages import importr
-globals()['importr'] = importr
+def setup_ergm():
 
-from rpy2.robjects import IntVector
-globals()['IntVector'] = IntVector
+    """
+    Sets up the R environment for ERGM analysis, installing the required R packages if they are missing.
+    """
 
-from rpy2.robjects import Formula
-globals()['Formula'] = Formula
+    _ensure_r_env()
 
-from rpy2.robjects import numpy2ri
-globals()['numpy2ri'] = numpy2ri
+def __getattr__(name):
 
-from rpy2.robjects import pandas2ri
-globals()['pandas2ri'] = pandas2ri
+    """
+    Lazily loads ERGM functions and R objects on first access.
+    """
 
-numpy2ri.activate()
+    if name in _ERGM_FUNCTIONS:
+        ergm_functions = importlib.import_module('.ergm_functions', __name__)
+        return getattr(ergm_functions, name)
 
-# globals()['r_emulator'] = r_emulator
+    if name in _R_OBJECTS:
+        _ensure_r_env()
+        return globals()[name]
 
-globals()['base'] = importr('base')
-globals()['utils'] = importr('utils')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
-utils.chooseCRANmirror(ind=1)
-utils.install_packages('ergm')
-utils.install_packages('igraph')
+def __dir__():
 
-globals()['ergm'] = importr('ergm', on_conflict="warn")
-globals()['networkr'] = importr('network', on_conflict="warn")
+    """
+    Lists module attributes, including lazily loaded names.
+    """
 
-from .ergm_functions import casenet_fit_ergm, case_fit_ergm, create_ergm, fit_ergm, edge_probabilities, casenet_edge_probabilities, case_edge_probabilities, ergm_edge_probabilities
\ No newline at end of file
+    return sorted(list(globals().keys()) + list(_ERGM_FUNCTIONS) + list(_R_OBJECTS))
@@ -9,6 +9,146 @@ See documentation:
     * R ERGM: https://cran.r-project.org/web/packages/ergm/ergm.pdf 
 """
 
+from ...core.basics import inv_logit
+from ...core.cleaners import text_splitter
+
+import io
+import sys
+import numpy as np
+import pandas as pd
+from igraph import Graph
+from networkx.classes import Graph as NetworkX_Undir, DiGraph as NetworkX_Dir, MultiGraph as NetworkX_Multi
+
+# Setting up R environment on first import and retrieving module-level R package handles
+from . import _ensure_r_env
+
+try:
+    _ensure_r_env()
+except Exception as e:
+    raise ImportError('ERGM analysis requires R and the rpy2 package to be installed.') from e
+
+from . import robjects, Formula, numpy2ri, pandas2ri, base, ergm, networkr
+
+
+def _igraph_edges(network) -> np.ndarray:
+    
+    """
+    Returns the edges of an igraph.Graph as an (E, 2) integer array, without self-loops or duplicate edges.
+    """
+    
+    edges = np.asarray(network.get_edgelist(), dtype = np.int32).reshape(-1, 2)
+    
+    # Dropping self-loops and duplicate edges, matching the binary adjacency matrix previously passed to R
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    if not network.is_directed():
+        edges = np.sort(edges, axis = 1)
+    
+    return np.unique(edges, axis = 0)
+
+
+def _igraph_to_r_network(network, edges):
+    
+    """
+    Builds an R network object for an igraph.Graph from its edge list, so only O(E) data crosses into R.
+    """
+    
+    # Initialising network with all vertices so isolates are kept
+    input_network = networkr.network_initialize(network.vcount(), directed = network.is_directed())
+    
+    # Adding edges, shifted to R's 1-based indexing
+    if len(edges) > 0:
+        input_network = networkr.network_edgelist(numpy2ri.py2rpy(edges + 1), input_network)
+    
+    return input_network
+
+
+# Separator printed between ERGM result sections
+_RESULT_SEP = '\n - - - - - - - - - - - - - - - - - - - - - - - - - - - -\n'
+
+def _fmt_default(value) -> str:
+    
+    """
+    Formats an ERGM result section for printing.
+    """
+    
+    return str(value)
+
+def _fmt_attrs(value) -> str:
+    
+    """
+    Formats ERGM network attributes for printing, one attribute per line.
+    """
+    
+    return '\n'.join(str(item) for item in value['Network attributes:'])
+
+def _fmt_coefs(value) -> str:
+    
+    """
+    Formats ERGM coefficients for printing, followed by the significance codes.
+    """
+    
+    return str(value) + '\n\n Signif. codes:  0 ‘***’ 0.001 ‘**’ 0.01 ‘*’ 0.05 ‘.’ 0.1 ‘ ’ 1'
+
+# Formatters for ERGM result sections which are not printed as-is
+_RESULT_FORMATTERS = {
+                    'network_attributes': _fmt_attrs,
+                    'coefficients': _fmt_coefs
+                    }
+
+
+# Cache of recent ERGM fits, keyed by network structure and formula terms
+_ERGM_CACHE = {}
+_ERGM_CACHE_SIZE = 8
+
+def _fit_cached(network, terms, refit = False):
+    
+    """
+    Fits an ERGM to a network, returning the formula and fitted model. Fits are cached by network structure and terms, so
+    fitting and then calculating edge probabilities for the same network only runs the estimation once. If refit is True,
+    the model is always re-estimated and replaces any cached fit.
+    """
+    
+    # Checking type of terms; if string, wrapping as a list
+    if type(terms) is str:
+        terms = [terms]
+    
+    # Checking type of network; if NetworkX, converting to igraph.Graph
+    if (
+            (type(network) == NetworkX_Undir)
+            or (type(network) == NetworkX_Dir)
+            or (type(network) == NetworkX_Multi)
+        ):
+             network = Graph.from_networkx(network)
+    
+    # Fingerprinting the network's structure, so changes to a network made in place are not served a stale fit
+    edges = _igraph_edges(network)
+    key = (network.vcount(), network.is_directed(), len(edges), hash(edges.tobytes()), tuple(terms))
+    
+    if (refit == False) and (key in _ERGM_CACHE):
+        return _ERGM_CACHE[key]
+    
+    # Creating R network object from edge list
+    input_network = _igraph_to_r_network(network, edges)
+    
+    # Creating a new R environment for each fit, so each fitted formula keeps referring to its own network
+    env = robjects.Environment()
+    env['input_network'] = input_network
+    
+    # Creating formula for R code
+    formula_str = 'input_network ~ ' + ' + '.join(terms)
+    formula = Formula(formula_str, environment = env)
+    
+    # Fitting ERGM in R
+    output = ergm.ergm(formula)
+    
+    # Caching fit, evicting the oldest entry if full
+    _ERGM_CACHE.pop(key, None)
+    if len(_ERGM_CACHE) >= _ERGM_CACHE_SIZE:
+        _ERGM_CACHE.pop(next(iter(_ERGM_CACHE)))
+    _ERGM_CACHE[key] = (formula, output)
+    
+    return formula, output
+
 
 def casenet_fit_ergm(self, network = 'request_input', terms = 'edges'):
     
@@ -84,43 +224,8 @@ def create_ergm(network, terms: list = ['edges']):
         fitted ERGM.
     """
     
-    # Checking type of terms; if string, wrapping as a list
-    if type(terms) is str:
-        terms = [terms]
-    
-    # Checking type of network; if NetworkX, converting to igraph.Graph
-    if (
-            (type(network) == NetworkX_Undir)
-            or (type(network) == NetworkX_Dir)
-            or (type(network) == NetworkX_Multi)
-        ):
-             network = Graph.from_networkx(network)
-    
-    # Generating adjacency matrix
-    adjMat = network.get_adjacency()
-    adjMat = np.array(adjMat.data)
-    
-    # Creating R network object from adjacency matrix
-    input_network = networkr.network(adjMat)
-    
-    # Creating formula string for R code
-    formula_str = 'input_network ~'
-    
-    # Adding terms to formula
-    count = 1
-    for term in terms:
-        if count > 1:
-            term = '+ ' + term
-        formula_str = formula_str + ' ' + term
-        count += 1
-    
-    # Setting up R environment using formula string
-    formula = Formula(formula_str)
-    env = formula.environment
-    env['input_network'] = input_network
-    
-    # Creating ERGM in R
-    output = ergm.ergm(formula)
+    # Fitting ERGM, caching the fit for later edge probability calculations
+    formula, output = _fit_cached(network = network, terms = terms, refit = True)
     
     return output
 
@@ -147,20 +252,16 @@ def fit_ergm(network, terms: list = ['edges'], print_results = True):
     """
     
     # Creating ERGM
-    output = create_ergm(network = network, terms = terms, from_case = from_case, case = case)
+    output = create_ergm(network = network, terms = terms)
     
     # Getting summary data
     summary = base.summary(output)
 
-    # Converting to dictionaries for parsing
-    output_dict = dict(zip(output.names, output))
-    summary_dict = dict(zip(summary.names, summary))
-    
-    # Parsing output and summary
-    formula_used = str(output_dict['formula']).replace('\n', '')
-    model_ref = str(output_dict['reference']).split('\n')[0].replace('~', '')
+    # Parsing output, retrieving only the required fields
+    formula_used = str(output.rx2('formula')).replace('\n', '')
+    model_ref = str(output.rx2('reference')).split('\n')[0].replace('~', '')
     ergm_version = text_splitter(
-                                str(output_dict['ergm_version']), 
+                                str(output.rx2('ergm_version')), 
                                 parse_by = ' ', 
                                 replace = ["‘", "’", '[1]', '\n']
                                 )[0]
@@ -170,8 +271,8 @@ def fit_ergm(network, terms: list = ['edges'], print_results = True):
                 ergm_version, 
                 formula_used, 
                 model_ref, 
-                output_dict['estimate'][0], 
-                output_dict['MCMCtheta'][0]
+                output.rx2('estimate')[0], 
+                output.rx2('MCMCtheta')[0]
                 ]
     
     # Creating dataframe for output data
@@ -188,7 +289,7 @@ def fit_ergm(network, terms: list = ['edges'], print_results = True):
                                 )
     
     # Cleaning output data
-    network_attr = text_splitter(str(output_dict['network']), parse_by = '\n')
+    network_attr = text_splitter(str(output.rx2('network')), parse_by = '\n')
     
     # Retrieving model network attributes and assigning to dictionary
     network_attr_dict = {}
@@ -196,15 +297,18 @@ def fit_ergm(network, terms: list = ['edges'], print_results = True):
     network_attr_dict[network_attr[-3]] = network_attr[-2]
     network_attr_dict[network_attr[-1]] = None
 
-    # Retrieving model covariance matrices
-    cov_mats_list = [
-                    summary_dict['asycov'][0][0], 
-                    summary_dict['asyse'][0]
-                    ]
-    
+    # Retrieving summary fields, converting each R vector to NumPy or pandas in a single conversion
+    with (robjects.default_converter + numpy2ri.converter + pandas2ri.converter).context():
+        coefs = summary.rx2('coefficients')
+        asycov = np.asarray(summary.rx2('asycov'))
+        asyse = np.asarray(summary.rx2('asyse'))
+        devtable = np.asarray(summary.rx2('devtable'))
+        mle_lik = np.asarray(summary.rx2('mle.lik'))
+        null_lik = np.asarray(summary.rx2('null.lik'))
+
     # Creating dataframe for model covariance matrices
     cov_mats = pd.DataFrame(
-                            cov_mats_list, 
+                            [asycov.ravel()[0], asyse.ravel()[0]], 
                             index = [
                                         'Asymptotic Covariance Matrix', 
                                         'Asymptotic Standard Error Matrix'
@@ -212,22 +316,12 @@ def fit_ergm(network, terms: list = ['edges'], print_results = True):
                             columns = ['']
                             )
     
-    # Creating dataframe for model coefficients
-    coefs = pd.DataFrame(
-                        summary_dict['coefficients'][0], 
-                        index = [
-                                'Estimate', 
-                                'Std. Error', 
-                                'MCMC %', 
-                                'z value', 
-                                'Pr (>|z|)'
-                                ], 
-                        columns = ['edges']
-                        ).transpose()
+    # Creating dataframe for model coefficients, indexed by term
+    coefs = pd.DataFrame(coefs)
 
     # Creating dataframe for model deviance
     deviance = pd.DataFrame(
-                            summary_dict['devtable'], 
+                            devtable, 
                             index = [
                                     'Null Deviance', 
                                     'Residual Deviance'
@@ -240,16 +334,14 @@ def fit_ergm(network, terms: list = ['edges'], print_results = True):
     
     # Creating array for model likelihood ratios
     lr_array = [
-                summary_dict['mle.lik'][0], 
-                summary_dict['null.lik'][0]
+                mle_lik.ravel()[0], 
+                null_lik.ravel()[0]
                 ]
     lrs = pd.DataFrame(lr_array, index = ['MLE', 'NULL'], columns = ['LE']).transpose()
     
-    coefs_df = coefs['Estimate'].to_frame()
-
-    coefs_df = coefs_df['Estimate'].apply(inv_logit)
-    if isinstance(coefs_df, pd.DataFrame):
-        coefs_df = coefs_df.rename(columns={"Estimate": "Probability"})
+    # Converting coefficient estimates to probabilities in one vectorised operation
+    probs = inv_logit(coefs['Estimate'].to_numpy(dtype = np.float64))
+    coefs_df = pd.DataFrame({'Probability': probs}, index = coefs.index)
     
     # Bundling results into a dictionary
     results = {
@@ -264,24 +356,16 @@ def fit_ergm(network, terms: list = ['edges'], print_results = True):
     
     if print_results == True:
         
-        # Printing results
-        for key in results.keys():
-
-            print('\n - - - - - - - - - - - - - - - - - - - - - - - - - - - -')
-            print('\n'+key+'\n')
-
-            if key == 'network_attributes':
-                for item in results[key]['Network attributes:']:
-                    print(item)
-
-            elif key == 'coefficients':
-                print(results[key])
-                print('\n Signif. codes:  0 ‘***’ 0.001 ‘**’ 0.01 ‘*’ 0.05 ‘.’ 0.1 ‘ ’ 1')
-
-            else:
-                print(results[key])
+        # Buffering results and printing them in a single write
+        buf = io.StringIO()
+        for key, value in results.items():
+            buf.write(_RESULT_SEP)
+            buf.write('\n' + key + '\n\n')
+            buf.write(_RESULT_FORMATTERS.get(key, _fmt_default)(value))
+            buf.write('\n')
 
-        print('\n - - - - - - - - - - - - - - - - - - - - - - - - - - - -')
+        buf.write(_RESULT_SEP)
+        sys.stdout.write(buf.getvalue())
     
     return results
 
@@ -296,7 +380,7 @@ def edge_probabilities(self, terms = ['edges']):
         name or list of name of terms for formula.
     """
     
-    return ergm_edge_probabilities(network = self, terms = 'edges', from_case = False, case = None)
+    return ergm_edge_probabilities(network = self, terms = terms)
 
 def casenet_edge_probabilities(self, network = 'request_input', terms = 'edges'):
     
@@ -354,50 +438,12 @@ def ergm_edge_probabilities(network, terms = ['edges']):
         dataframe of edge probabilities.
     """
     
-    # Checking type of terms; if string, wrapping as a list
-    if type(terms) is str:
-        terms = [terms]
-    
-    # Checking type of network; if NetworkX, converting to igraph.Graph
-    if (
-            (type(network) == NetworkX_Undir)
-            or (type(network) == NetworkX_Dir)
-            or (type(network) == NetworkX_Multi)
-        ):
-             network = Graph.from_networkx(network)
-
-    # Generating adjacency matrix
-    adjMat = network.get_adjacency()
-    adjMat = np.array(adjMat.data)
-    
-    # Creating R network object from adjacency matrix
-    input_network = networkr.network(adjMat)
-
-    # Creating formula string to input into R
-    formula_str = 'input_network ~'
-    
-    # Adding terms to formula
-    count = 1
-    for term in terms:
-        if count > 1:
-            term = '+ ' + term
-        formula_str = formula_str + ' ' + term
-        count += 1
-    
-    # Setting up R environment using formula string
-    formula = Formula(formula_str)
-    env = formula.environment
-    env['input_network'] = input_network
-    
-    # Fitting ERGM
-    output = ergm.ergm(formula)
-    
-    # Retrieving results
-    output_dict = dict(zip(output.names, output))
+    # Fitting ERGM, reusing the fit from create_ergm or fit_ergm if a network with the same structure and terms was used
+    formula, output = _fit_cached(network = network, terms = terms)
     
-    # Retrieving edge probabilities values
-    theta_val = output_dict['MCMCtheta'][0]
-    probs = ergm.predict_formula(formula, theta = theta_val)
+    # Retrieving edge probabilities values, using the full vector of fitted coefficients so multi-term models are supported
+    theta = output.rx2('coefficients')
+    probs = ergm.predict_formula(formula, theta = theta)
     
     # Converting to dataframe
     with (robjects.default_converter + pandas2ri.converter).context():
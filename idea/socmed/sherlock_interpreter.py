@@ -6,20 +6,66 @@ Developed by making edits to the sherlock.main() function.
 
 from .sherlock.result import QueryStatus
 from .sherlock.result import QueryResult
-from .sherlock.notify import QueryNotifyPrint
+from .sherlock.notify import QueryNotify, QueryNotifyPrint
 from .sherlock.sites import SitesInformation
 from .sherlock.sherlock import module_name, __version__, SherlockFuturesSession, get_response, check_for_parameter, multiple_usernames, sherlock, timeout_check, handler, main
 
+import functools
 import pandas as pd
 import os
-import platform
 import re
 from time import monotonic
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 from requests_futures.sessions import FuturesSession
 from torrequest import TorRequest
 
-def search_username(username: str = 'request_input', site_list = None, sites_json = None, nsfw = True, tor = None, unique_tor = False, proxy = None, timeout = 60, browse = False, verbose = False, print_all = False, output = 'dataframe'):
+# Fields of each site's result returned by sherlock()
+_RESULT_COLUMNS = ['url_main', 'url_user', 'status', 'http_status', 'response_text']
+
+@functools.lru_cache(maxsize = 1)
+def _check_sherlock_update():
+
+    """
+    Fetches the latest Sherlock version number from GitHub. Cached for the life of the process.
+    """
+
+    r = requests.get(
+        "https://raw.githubusercontent.com/sherlock-project/sherlock/master/sherlock/sherlock.py"
+    )
+
+    return str(re.findall('__version__ = "(.*)"', r.text)[0])
+
+@functools.lru_cache(maxsize = 4)
+def _load_sites(sites_json = None, nsfw = True):
+
+    """
+    Loads Sherlock site information, removing NSFW sites if not wanted. Cached by data file path and NSFW setting, so
+    repeated searches do not reparse the site data.
+    """
+
+    # Create object with all information about sites we are aware of.
+    try:
+        if sites_json is None:
+            sites = SitesInformation(
+                os.path.join(os.path.dirname(__file__), "sherlock/resources/data.json")
+            )
+        else:
+            sites = SitesInformation(sites_json)
+    
+    # Raising exception
+    except Exception as error:
+        print(f"ERROR:  {error}")
+        sites = SitesInformation()
+
+    # Removing NSFW sites if not wanted, skipping the removal if the site data has none
+    if not nsfw:
+        if any(site.is_nsfw for site in sites):
+            sites.remove_nsfw_sites()
+
+    return sites
+
+def search_username(username: str = 'request_input', site_list = None, sites_json = None, nsfw = True, tor = None, unique_tor = False, proxy = None, timeout = 60, browse = False, verbose = False, print_all = False, output = 'dataframe', check_for_update = False):
     
     """
     Runs a Sherlock search for a username.
@@ -51,27 +97,18 @@ def search_username(username: str = 'request_input', site_list = None, sites_jso
         whether to print all results, including failed results.
     output : str
         type of data format to output. Defaults to dataframe.
+    check_for_update : bool
+        whether to check GitHub for a newer version of Sherlock. Defaults to False.
     
     Returns
     -------
     result
         a set of usernames found by Sherlock.
     """
-    try:
-        # Setting version
-        version_string = (
-            f"%(prog)s {__version__}\n"
-            + f"{requests.__description__}:  {requests.__version__}\n"
-            + f"Python:  {platform.python_version()}"
-                        )
-    
-        # Check for newer version of Sherlock. If it exists, let the user know about it
+    # Checking for a newer version of Sherlock only when requested
+    if check_for_update == True:
         try:
-            r = requests.get(
-                "https://raw.githubusercontent.com/sherlock-project/sherlock/master/sherlock/sherlock.py"
-            )
-
-            remote_version = str(re.findall('__version__ = "(.*)"', r.text)[0])
+            remote_version = _check_sherlock_update()
             local_version = __version__
 
             if remote_version != local_version:
@@ -83,9 +120,6 @@ def search_username(username: str = 'request_input', site_list = None, sites_jso
         except Exception as error:
             print(f"A problem occurred while checking for an update: {error}")
     
-    except:
-        pass
-    
     # Requesting username from user input if none provided
     if username == 'request_input':
         username = input('Username: ')
@@ -108,28 +142,8 @@ def search_username(username: str = 'request_input', site_list = None, sites_jso
         )
 
 
-    # Create object with all information about sites we are aware of.
-    if sites_json != None:
-        local = False
-    else:
-        local = True
-        
-    try:
-        if local == True:
-            sites = SitesInformation(
-                os.path.join(os.path.dirname(__file__), "sherlock/resources/data.json")
-            )
-        else:
-            sites = SitesInformation(sites_json)
-    
-    # Raising exception
-    except Exception as error:
-        print(f"ERROR:  {error}")
-        sites = SitesInformation()
-    
-    # Removing NSFW sites if not wanted
-    if not nsfw == False:
-        sites.remove_nsfw_sites()
+    # Loading site information
+    sites = _load_sites(sites_json, bool(nsfw))
 
     # Create original dictionary from SitesInformation() object.
     # Eventually, the rest of the code will be updated to use the new object
@@ -143,13 +157,15 @@ def search_username(username: str = 'request_input', site_list = None, sites_jso
         # Make sure that the sites are supported & build up pruned site database.
         site_data = {}
         site_missing = []
+
+        # Indexing site names by lowercase name for case-insensitive lookup
+        lower_index = {name.lower(): name for name in site_data_all}
+
         for site in site_list:
-            counter = 0
-            for existing_site in site_data_all:
-                if site.lower() == existing_site.lower():
-                    site_data[existing_site] = site_data_all[existing_site]
-                    counter += 1
-            if counter == 0:
+            existing_site = lower_index.get(site.lower())
+            if existing_site is not None:
+                site_data[existing_site] = site_data_all[existing_site]
+            else:
                 # Build up list of sites not supported for future error message.
                 site_missing.append(f"'{site}'")
 
@@ -180,42 +196,63 @@ def search_username(username: str = 'request_input', site_list = None, sites_jso
             else:
                 all_usernames.append(u)
     
-    results_dict = {}
-    
-    
-    for u in all_usernames:
-        results = sherlock(
+    def search_user(u, user_notify):
+
+        # Copying each site's information, as sherlock() stores its request futures in it
+        user_site_data = {site: dict(info) for site, info in site_data.items()}
+
+        return sherlock(
             u,
-            site_data,
-            query_notify,
+            user_site_data,
+            user_notify,
             tor=tor,
             unique_tor=unique_tor,
             proxy=proxy,
             timeout=timeout,
         )
 
-        results_dict[u] = results
+    # Searching serially, printing results as they arrive, for a single username or when using Tor, as each search
+    # starts its own Tor instance on the same ports
+    if tor or unique_tor or (len(all_usernames) <= 1):
+        results_list = [search_user(u, query_notify) for u in all_usernames]
+
+    # Otherwise searching for all usernames concurrently, as searches are bound by network latency
+    else:
+        results_list = [None] * len(all_usernames)
+
+        # Using silent notifiers in worker threads, so output from concurrent searches does not interleave
+        with ThreadPoolExecutor(max_workers = min(8, len(all_usernames))) as executor:
+            futures = {executor.submit(search_user, u, QueryNotify()): i for i, u in enumerate(all_usernames)}
+            for future in as_completed(futures):
+                results_list[futures[future]] = future.result()
+
+        # Printing each user's results in order once all searches are complete
+        for u, results in zip(all_usernames, results_list):
+            query_notify.start(u)
+            for info in results.values():
+                query_notify.update(info['status'])
+
+    frames = []
+    
+    for results in results_list:
+
+        # Converting each user's results to a dataframe, keeping only claimed sites
+        if output == 'dataframe':
+            claimed = {site: info for site, info in results.items() if str(info.get('status')) == 'Claimed'}
+            df = pd.DataFrame.from_dict(claimed, orient = 'index', columns = _RESULT_COLUMNS, dtype = object)
+            df['status'] = df['status'].astype(str)
+            df.index.name = 'site'
+            frames.append(df)
         
     query_notify.finish()
     
     if output == 'dataframe':
         
-        if len(results_dict.keys()) <= 1:
-            df = pd.DataFrame.from_dict(results_dict[username], dtype = object).T
-            df['status'] = df['status'].astype(str)
-            df = df[df['status'] == 'Claimed']
-            df.index.name = 'site'
-            
-            res = df
-            
+        if len(frames) <= 1:
+            res = frames[0]
         
+        # Combining users' results into a single dataframe indexed by username and site
         else:
-            res = {}
-            for u in results_dict.keys():
-                df = pd.DataFrame.from_dict(results_dict[u], dtype = object).T
-                df['status'] = df['status'].astype(str)
-                df = df[df['status'] == 'Claimed']
-                df.index.name = 'site'
-                output[u] = df
+            res = pd.concat(frames, keys = all_usernames, names = ['username', 'site'])
         
-        return res
\ No newline at end of file
+        return res
@@ -4,63 +4,83 @@
 import json
 import pandas as pd
 import re
-from tkinter import filedialog
-from tkinter import Tk
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
-def process_telegram_data(post_link_base, from_file = True, input_dict = None):
+# Regular expression pattern to find latitude and longitude
+_COORD_RE = re.compile(r'(-?\d+\.\d+),\s*(-?\d+\.\d+)')
+
+
+def _iter_json_messages(json_file_path):
     
-    # Initialize an empty list to hold messages with coordinates
-    messages_with_coordinates = []
+    # Stream messages one at a time if ijson is available, so the whole export is never held in memory
+    if ijson is not None:
+        with open(json_file_path, 'rb') as f:
+            yield from ijson.items(f, 'messages.item')
+    
+    else:
+        with open(json_file_path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)['messages']
 
-    # Regular expression pattern to find latitude and longitude
-    coordinate_pattern = re.compile(r'(-?\d+\.\d+),\s*(-?\d+\.\d+)')
+
+def process_telegram_data(post_link_base, from_file = True, input_dict = None):
     
     # Load the JSON file
     
     if from_file == True:
         
         json_file_path = input("JSON file to process: ")
-
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            telegram_data = json.load(f)
+        messages = _iter_json_messages(json_file_path)
     
     else:
-        telegram_data = input_dict
-
-    # Iterate through all messages to find those with coordinates
-    for message in telegram_data['messages']:
-        text_field = str(message.get('text', ''))
-        coordinates_match = coordinate_pattern.search(text_field)
-
-        if coordinates_match:
-            latitude, longitude = coordinates_match.groups()
-            post_id = message.get('id', 'N/A')
-            post_date = message.get('date', 'N/A')
-            post_type = message.get('type', 'N/A')
-            post_text = text_field
-            media_type = message.get('media_type', 'N/A')
-
-            message_info = {
-                'Post ID': post_id,
-                'Post Date': post_date,
-                'Post Message': post_text,
-                'Post Type': post_type,
-                'Media Type': media_type,
-                'Latitude': latitude,
-                'Longitude': longitude
-            }
-
-            messages_with_coordinates.append(message_info)
-
-    # Create a DataFrame and add the Post Link
-    df = pd.DataFrame(messages_with_coordinates)
-    df['Post Link'] = post_link_base + df['Post ID'].astype(str)
+        messages = input_dict['messages']
+    
+    # Columns of the output, filled only for messages with coordinates
+    post_links = []
+    post_ids = []
+    post_dates = []
+    post_messages = []
+    post_types = []
+    media_types = []
+    latitudes = []
+    longitudes = []
+    
+    # Binding the compiled pattern's search method once, outside the message loop
+    search = _COORD_RE.search
+    
+    # Search each message for coordinates, keeping fields for matched messages only
+    for message in messages:
+        
+        text = str(message.get('text', ''))
+        match = search(text)
+        
+        if match is None:
+            continue
+        
+        post_id = message.get('id', 'N/A')
+        post_links.append(f'{post_link_base}{post_id}')
+        post_ids.append(post_id)
+        post_dates.append(message.get('date', 'N/A'))
+        post_messages.append(text)
+        post_types.append(message.get('type', 'N/A'))
+        media_types.append(message.get('media_type', 'N/A'))
+        latitude, longitude = match.groups()
+        latitudes.append(latitude)
+        longitudes.append(longitude)
 
-    # Reorder the columns
-    column_order = ['Post Link', 'Post ID', 'Post Date', 'Post Message', 'Post Type', 'Media Type', 'Latitude',
-                    'Longitude']
-    df = df[column_order]
+    # Create the DataFrame column by column, in the final column order
+    df = pd.DataFrame({
+        'Post Link': post_links,
+        'Post ID': post_ids,
+        'Post Date': post_dates,
+        'Post Message': post_messages,
+        'Post Type': post_types,
+        'Media Type': media_types,
+        'Latitude': latitudes,
+        'Longitude': longitudes
+    })
 
     return df
-